@@ -6,42 +6,91 @@
 # 4. Plots Geotagged Attack Map
 
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 import os
-import hashlib
 from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import StandardScaler
 
-LOG_FILE = 'forensic_log_v3.csv'
+from hashchain import chain_digest
+
+LOG_FILE = 'forensic_log_v3.bin'
 # Key features for the attack signature
 FEATURES = ['rf_filter', 'mic_piezo', 'mic_air', 'gsr_raw', 'rf_broad']
 
+# Packed binary record layout written by the firmware (REC_FMT in
+# firmware/main.py), mirrored as a numpy structured dtype so the log
+# loads as fixed-width narrow columns with no text parsing at all.
+# Use analysis/convert_log.py if a CSV copy is needed for other tools.
+REC_DTYPE = np.dtype([
+    ('timestamp', '<u8'), ('rf_broad', '<f4'), ('rf_filter', '<f4'),
+    ('mic_air', '<u2'), ('mic_piezo', '<u2'), ('gsr_raw', '<u2'),
+    ('ax', '<i2'), ('ay', '<i2'), ('az', '<i2'),
+    ('gx', '<i2'), ('gy', '<i2'), ('gz', '<i2'),
+    ('mx', '<i2'), ('my', '<i2'), ('mz', '<i2'),
+    ('lat', '<i4'), ('lon', '<i4'), ('alt', '<f4'),
+    ('prev_hash', 'S32')])
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+
+def count_records(filepath):
+    """Number of records actually written.
+
+    The firmware preallocates the log file, so everything past the
+    write point is zero-filled — binary-search for the first all-zero
+    record instead of trusting the file size.
+    """
+    rec_size = REC_DTYPE.itemsize
+    zero = b'\x00' * rec_size
+    lo, hi = 0, os.path.getsize(filepath) // rec_size
+    with open(filepath, 'rb') as f:
+        while lo < hi:
+            mid = (lo + hi) // 2
+            f.seek(mid * rec_size)
+            if f.read(rec_size) == zero:
+                hi = mid
+            else:
+                lo = mid + 1
+    return lo
 
-def verify_hash_chain(df):
-    """Verifies the SHA-256 hash chain. Returns True if valid."""
+
+def verify_hash_chain(filepath):
+    """Verifies the hash chain by streaming the raw binary records.
+
+    The chain is defined over the packed record bytes exactly as the
+    firmware hashed them, so no DataFrame is needed and memory stays
+    O(1) no matter how large the log is. The 32-byte prev_hash field
+    sits at the end of each record.
+    """
     print("\n--- FORENSIC VERIFICATION (V3.0) ---")
     is_valid = True
+    rec_size = REC_DTYPE.itemsize
+    total = count_records(filepath)
 
-    if df.iloc[0]['prev_hash'] != "0" * 64:
-        print("!! TAMPERING DETECTED: Genesis hash (line 1) is incorrect. !!")
+    if total == 0:
+        print("!! Log file contains no entries. !!")
         return False
 
-    for i in range(1, len(df)):
-        prev = df.iloc[i - 1]
-        # Reconstruct the exact string from the previous line
-        prev_line_string = (f"{prev['timestamp']},{prev['rf_broad']:.2f},{prev['rf_filter']:.2f},"
-                            f"{prev['mic_air']},{prev['mic_piezo']},{prev['gsr_raw']},"
-                            f"{prev['ax']},{prev['ay']},{prev['az']},{prev['gx']},{prev['gy']},{prev['gz']},"
-                            f"{prev['mx']},{prev['my']},{prev['mz']},"
-                            f"{prev['lat']:.6f},{prev['lon']:.6f},{prev['alt']:.1f},{prev['prev_hash']}")
+    with open(filepath, 'rb') as f:
+        prev = f.read(rec_size)
 
-        expected_hash = hashlib.sha256(prev_line_string.encode('utf-8')).hexdigest()
-        stored_hash = df.iloc[i]['prev_hash']
+        if prev[-32:] != b'\x00' * 32:
+            print("!! TAMPERING DETECTED: Genesis hash (record 1) is incorrect. !!")
+            return False
 
-        if expected_hash != stored_hash:
-            print(f"!! TAMPERING DETECTED at line {i + 1} !!")
-            is_valid = False
-            break
+        for row in range(2, total + 1):
+            rec = f.read(rec_size)
+            if len(rec) < rec_size:
+                break  # trailing partial record (power cut mid-write)
+
+            if chain_digest(prev) != rec[-32:]:
+                print(f"!! TAMPERING DETECTED at record {row} !!")
+                is_valid = False
+                break
+            prev = rec
 
     if is_valid:
         print("VERIFIED: Log file integrity is 100%.")
@@ -50,44 +99,80 @@ def verify_hash_chain(df):
     return is_valid
 
 
+def _rolling_mean(arr, window):
+    """Cumsum-based rolling mean (NaN for the first window-1 samples)."""
+    out = np.full(arr.shape, np.nan)
+    csum = np.cumsum(arr, dtype=np.float64)
+    out[window - 1:] = (csum[window - 1:] - np.concatenate(([0.0], csum[:-window]))) / window
+    return out
+
+
 def analyze_log(df):
     print("\n--- SENSOR LOG ANALYSIS (V3.0) ---")
 
-    # Center the mic data to find amplitude (relative to its own noise)
-    df['piezo_amp'] = (df['mic_piezo'] - df['mic_piezo'].rolling(100).mean()).abs()
-    df['air_amp'] = (df['mic_air'] - df['mic_air'].rolling(100).mean()).abs()
+    # Center the mic data to find amplitude (relative to its own noise).
+    # Computed on raw numpy arrays — pandas .rolling() allocates a Series
+    # per step and is far slower than a single cumsum pass.
+    piezo = df['mic_piezo'].to_numpy(dtype=np.float64)
+    air = df['mic_air'].to_numpy(dtype=np.float64)
+    gsr = df['gsr_raw'].to_numpy(dtype=np.float64)
+
+    df['piezo_amp'] = np.abs(piezo - _rolling_mean(piezo, 100))
+    df['air_amp'] = np.abs(air - _rolling_mean(air, 100))
     # GSR is a slow-moving signal. We care about the *change* (derivative)
-    df['gsr_spike'] = df['gsr_raw'].diff().abs()
+    df['gsr_spike'] = np.abs(np.diff(gsr, prepend=gsr[0]))
 
     # Features for the ML model - we use the new calculated features
     features_for_ml = ['rf_filter', 'piezo_amp', 'air_amp', 'gsr_spike', 'rf_broad']
 
-    # ML model can't handle NaNs from rolling/diff, so fill them
-    df_ml = df[features_for_ml].fillna(0)
+    # ML model can't handle NaNs from rolling/diff, so fill them.
+    # Scale in place from a single mean/std reduction — the same stats
+    # feed both the model input and the signature thresholds below, so
+    # the data is scanned once instead of once per column.
+    # float32: scikit-learn's tree code works in float32 internally, so
+    # feeding float64 just doubles the memory traffic for no precision.
+    X = df[features_for_ml].fillna(0).to_numpy(dtype=np.float32)
+    mu = X.mean(axis=0)
+    sd = X.std(axis=0)
+    sd[sd == 0] = 1.0  # constant column; avoid dividing by zero
+    np.subtract(X, mu, out=X)
+    np.divide(X, sd, out=X)
 
-    scaler = StandardScaler()
-    df_scaled = scaler.fit_transform(df_ml)
-
-    model = IsolationForest(contamination=0.001, random_state=42)
+    model = IsolationForest(n_estimators=100, max_samples=256,
+                            contamination=0.001, random_state=42, n_jobs=-1)
     print("Training ML model...")
-    model.fit(df_scaled)
+    model.fit(X)
 
     print("Predicting anomalies...")
-    df['is_anomaly'] = model.predict(df_scaled)  # -1 for anomaly
-
-    # Filter for the specific V3.0 signature:
-    piezo_threshold = df['piezo_amp'].mean() + 3 * df['piezo_amp'].std()
-    air_threshold = df['air_amp'].mean() + 1 * df['air_amp'].std()  # Must be LOW
-    rf_threshold = df['rf_filter'].mean() + 2 * df['rf_filter'].std()
-    gsr_threshold = df['gsr_spike'].mean() + 3 * df['gsr_spike'].std()  # Must have a GSR spike
-
-    attacks = df[
-        (df['is_anomaly'] == -1) &
-        (df['piezo_amp'] > piezo_threshold) &
-        (df['air_amp'] < air_threshold) &
-        (df['rf_filter'] > rf_threshold) &
-        (df['gsr_spike'] > gsr_threshold)
-        ]
+    df['is_anomaly'] = model.predict(X)  # -1 for anomaly
+
+    # Filter for the specific V3.0 signature (indices follow features_for_ml):
+    rf_threshold = mu[0] + 2 * sd[0]
+    piezo_threshold = mu[1] + 3 * sd[1]
+    air_threshold = mu[2] + 1 * sd[2]  # Must be LOW
+    gsr_threshold = mu[3] + 3 * sd[3]  # Must have a GSR spike
+
+    # Reduce the five conditions in one scan over the column arrays
+    # (numexpr fuses them into a single SIMD pass when available)
+    # instead of allocating an intermediate boolean Series per clause.
+    signature = {'anom': df['is_anomaly'].to_numpy(),
+                 'pz': df['piezo_amp'].to_numpy(), 'pt': piezo_threshold,
+                 'ar': df['air_amp'].to_numpy(), 'at': air_threshold,
+                 'rf': df['rf_filter'].to_numpy(), 'rt': rf_threshold,
+                 'gs': df['gsr_spike'].to_numpy(), 'gt': gsr_threshold}
+    if numexpr is not None:
+        mask = numexpr.evaluate(
+            "(anom == -1) & (pz > pt) & (ar < at) & (rf > rt) & (gs > gt)",
+            local_dict=signature)
+    else:
+        mask = np.logical_and.reduce([
+            signature['anom'] == -1,
+            signature['pz'] > piezo_threshold,
+            signature['ar'] < air_threshold,
+            signature['rf'] > rf_threshold,
+            signature['gs'] > gsr_threshold,
+        ])
+    attacks = df[mask]
 
     if attacks.empty:
         print("\n--- RESULT ---")
@@ -101,15 +186,16 @@ def analyze_log(df):
         attack_index = example_attack.index[0]
         plot_data = df.loc[max(0, attack_index - 30): min(len(df), attack_index + 30)].copy()
 
-        # Normalize for plotting
-        plot_data['RF Filter (norm)'] = (plot_data['rf_filter'] - plot_data['rf_filter'].min()) / (
-                    plot_data['rf_filter'].max() - plot_data['rf_filter'].min())
-        plot_data['Piezo Amp (norm)'] = (plot_data['piezo_amp'] - plot_data['piezo_amp'].min()) / (
-                    plot_data['piezo_amp'].max() - plot_data['piezo_amp'].min())
-        plot_data['Air Amp (norm)'] = (plot_data['air_amp'] - plot_data['air_amp'].min()) / (
-                    plot_data['air_amp'].max() - plot_data['air_amp'].min())
-        plot_data['GSR Spike (norm)'] = (plot_data['gsr_spike'] - plot_data['gsr_spike'].min()) / (
-                    plot_data['gsr_spike'].max() - plot_data['gsr_spike'].min())
+        # Normalize for plotting: one min/max scan over all four columns
+        # instead of one pair of scans per column.
+        plot_cols = ['rf_filter', 'piezo_amp', 'air_amp', 'gsr_spike']
+        arr = plot_data[plot_cols].to_numpy(dtype=np.float64)
+        mn = arr.min(axis=0)
+        rng = arr.max(axis=0) - mn
+        rng[rng == 0] = 1.0  # flat column; leave it at zero
+        normed = (arr - mn) / rng
+        plot_data[['RF Filter (norm)', 'Piezo Amp (norm)',
+                   'Air Amp (norm)', 'GSR Spike (norm)']] = normed
 
         plt.figure(figsize=(15, 7))
         plt.plot(plot_data['timestamp'], plot_data['RF Filter (norm)'], label='Weapon: Targeted RF', color='red',
@@ -158,11 +244,16 @@ def analyze_log(df):
 if __name__ == "__main__":
     if not os.path.exists(LOG_FILE):
         print(f"Error: {LOG_FILE} not found. Copy it from the SD card.")
-    else:
+    elif verify_hash_chain(LOG_FILE):
+        # Only pay for the DataFrame once the log is known to be genuine.
         print(f"Loading log file: {LOG_FILE}...")
-        data = pd.read_csv(LOG_FILE, low_memory=False)
+        data = pd.DataFrame(np.fromfile(LOG_FILE, dtype=REC_DTYPE,
+                                        count=count_records(LOG_FILE)))
+        # lat/lon are logged as fixed-point 1e-7 degrees (int32);
+        # convert back to degrees once, here on the host.
+        data['lat'] = data['lat'] * 1e-7
+        data['lon'] = data['lon'] * 1e-7
 
-        if verify_hash_chain(data):
-            analyze_log(data)
-        else:
-            print("Analysis aborted due to log integrity failure.")
+        analyze_log(data)
+    else:
+        print("Analysis aborted due to log integrity failure.")
@@ -0,0 +1,80 @@
+# convert_log.py
+# ufwv2ktracker V3.0 - Binary log to CSV converter
+# The firmware logs packed binary records (REC_FMT in firmware/main.py);
+# analysis.py reads them directly, but other tools often want CSV.
+# The hash chain is defined over the raw record bytes, so it is checked
+# here during conversion - the CSV text itself carries no chain. The
+# chain algorithm comes from hashchain.HASH_ALGO, shared with
+# analysis.py.
+
+import binascii
+import struct
+import sys
+
+from hashchain import chain_digest
+
+REC_FMT = "<QffHHHhhhhhhhhhiif32s"
+REC_SIZE = struct.calcsize(REC_FMT)
+
+CSV_HEADER = ("timestamp,rf_broad,rf_filter,mic_air,mic_piezo,gsr_raw,"
+              "ax,ay,az,gx,gy,gz,mx,my,mz,lat,lon,alt,prev_hash\n")
+CSV_ROW = ("%d,%.2f,%.2f,%d,%d,%d,"
+           "%d,%d,%d,%d,%d,%d,%d,%d,%d,"
+           "%.7f,%.7f,%.1f,%s\n")
+
+
+def convert(bin_path, csv_path):
+    """Converts a binary log to CSV, verifying the chain record by record.
+
+    Returns True if every record's prev_hash matched.
+    """
+    is_valid = True
+    prev = None
+    row = 0
+
+    with open(bin_path, 'rb') as fin, open(csv_path, 'w') as fout:
+        fout.write(CSV_HEADER)
+
+        zero = b'\x00' * REC_SIZE
+        while True:
+            rec = fin.read(REC_SIZE)
+            if len(rec) < REC_SIZE:
+                break  # trailing partial record (power cut mid-write)
+            if rec == zero:
+                break  # unwritten tail of a preallocated log
+            row += 1
+
+            if prev is None:
+                if rec[-32:] != b'\x00' * 32:
+                    print("!! TAMPERING DETECTED: Genesis hash (record 1) is incorrect. !!")
+                    is_valid = False
+            elif chain_digest(prev) != rec[-32:]:
+                print(f"!! TAMPERING DETECTED at record {row} !!")
+                is_valid = False
+            prev = rec
+
+            fields = struct.unpack(REC_FMT, rec)
+            # lat/lon are fixed-point 1e-7 degrees in the record;
+            # the CSV keeps plain degrees like the legacy format.
+            fout.write(CSV_ROW % (fields[:15]
+                                  + (fields[15] * 1e-7, fields[16] * 1e-7, fields[17])
+                                  + (binascii.hexlify(fields[18]).decode(),)))
+
+    if row == 0:
+        # Same verdict as analysis.verify_hash_chain: an empty log
+        # (e.g. freshly preallocated, never written) is not "verified".
+        print("!! Log file contains no entries. !!")
+        return False
+
+    print(f"Converted {row} records to {csv_path}")
+    if is_valid:
+        print("VERIFIED: Log file integrity is 100%.")
+    else:
+        print("CRITICAL: Log file has been tampered with.")
+    return is_valid
+
+
+if __name__ == "__main__":
+    bin_path = sys.argv[1] if len(sys.argv) > 1 else 'forensic_log_v3.bin'
+    csv_path = sys.argv[2] if len(sys.argv) > 2 else 'forensic_log_v3.csv'
+    convert(bin_path, csv_path)
@@ -0,0 +1,26 @@
+# hashchain.py
+# ufwv2ktracker V3.0 - Chain hash configuration
+# Single source of truth for the chain algorithm, shared by analysis.py
+# and convert_log.py so the two verifiers can never disagree about what
+# counts as tampering.
+
+import hashlib
+
+# Must match what the firmware logged with: stock firmware uses
+# SHA-256; set to 'blake3' for logs from a firmware build using BLAKE3
+# (SIMD-parallel, much faster per byte on the host).
+HASH_ALGO = 'sha256'
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+
+def chain_digest(data):
+    """Raw digest of one log record under the configured chain algorithm."""
+    if HASH_ALGO == 'blake3':
+        if blake3 is None:
+            raise RuntimeError("HASH_ALGO is 'blake3' but the blake3 package is not installed")
+        return blake3.blake3(data).digest()
+    return hashlib.sha256(data).digest()
@@ -2,14 +2,24 @@
 # Simple driver for a Grove-style GSR sensor
 
 from machine import ADC, Pin
+import array
+import micropython
 import time
 
+_WINDOW = micropython.const(100)
+
 
 class GSRSensor:
     def __init__(self, adc_pin):
         self.adc = ADC(Pin(adc_pin))
         self.adc.atten(ADC.ATTN_11DB)  # Set full 0-3.6V range
 
+        # Circular window for read_smoothed: typed array + running sum
+        # makes each update O(1) with no allocation.
+        self.hist = array.array('H', [0] * _WINDOW)
+        self.sum = 0
+        self.idx = 0
+
     def read_raw(self):
         """
         Reads the raw 12-bit ADC value (0-4095).
@@ -20,6 +30,21 @@ class GSRSensor:
         except Exception:
             return 0
 
+    @micropython.native
+    def read_smoothed(self):
+        """
+        Reads one raw sample and returns the rolling mean of the last
+        100 samples. The running-sum update costs O(1) per call, so the
+        smoothing that analysis.py used to do offline can happen at the
+        source. Reads below 100 samples average in the zero-filled
+        window (warm-up).
+        """
+        v = self.read_raw()
+        self.sum += v - self.hist[self.idx]
+        self.hist[self.idx] = v
+        self.idx = (self.idx + 1) % _WINDOW
+        return self.sum // _WINDOW
+
     def read_resistance(self):
         """
         Calculates the approximate skin resistance.
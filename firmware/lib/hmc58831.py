@@ -10,6 +10,7 @@ class HMC5883L:
     def __init__(self, i2c, address=0x1E):
         self.i2c = i2c
         self.address = address
+        self._buf = bytearray(6)  # reused per sample; no allocation at 75 Hz
 
         # Config Reg A: 75Hz data output rate
         self.i2c.writeto_mem(self.address, 0x00, b'\x18')
@@ -20,14 +21,12 @@ class HMC5883L:
 
     def read_raw(self):
         try:
-            # Read 6 bytes of data starting from 0x03
-            data = self.i2c.readfrom_mem(self.address, 0x03, 6)
+            # Read 6 bytes of data starting from 0x03 into the reused buffer
+            self.i2c.readfrom_mem_into(self.address, 0x03, self._buf)
 
             # Data is in X, Z, Y order
             # Each is a 16-bit signed big-endian value
-            x = ustruct.unpack_from('>h', data, 0)[0]
-            z = ustruct.unpack_from('>h', data, 2)[0]
-            y = ustruct.unpack_from('>h', data, 4)[0]
+            x, z, y = ustruct.unpack('>hhh', self._buf)
 
             return (x, y, z)
         except OSError:
@@ -2,15 +2,32 @@
 # A simple, lightweight NMEA sentence parser for MicroPython
 
 import time
+import micropython
+
+
+@micropython.native
+def _nmea_checksum(buf):
+    # XOR over the sentence payload bytes; native emitter keeps the
+    # per-byte loop out of the bytecode interpreter.
+    c = 0
+    for b in buf:
+        c ^= b
+    return c
 
 
 class MicropyGPS:
     def __init__(self):
         self.latitude = 0.0
         self.longitude = 0.0
+        # Fixed-point degrees * 1e7 (int32 range): the logger packs
+        # these directly, so position costs one integer load per sample
+        # instead of float attribute reads.
+        self.lat_e7 = 0
+        self.lon_e7 = 0
         self.altitude = 0.0
         self.satellites_used = 0
         self.timestamp = (0, 0, 0.0)
+        self.date = (0, 0, 0)  # (day, month, 2-digit year) from RMC
         self.fix_stat = 0
 
     def _parse_lat_lon(self, part_str, direction_str):
@@ -29,24 +46,35 @@ class MicropyGPS:
 
     def update(self, sentence):
         try:
-            if not sentence or not sentence.startswith('$GPGGA'):
-                return False
-
-            parts = sentence.split(',')
-            if len(parts) < 10:
+            if not sentence or not sentence.startswith('$'):
                 return False
 
             # Check checksum
             try:
                 payload, checksum = sentence.strip().split('*')
-                calc_checksum = 0
-                for char in payload[1:]:
-                    calc_checksum ^= ord(char)
+                calc_checksum = _nmea_checksum(payload[1:].encode())
                 if int(checksum, 16) != calc_checksum:
                     return False  # Checksum mismatch
             except:
                 return False  # Checksum parse error
 
+            parts = payload.split(',')
+
+            # $GPRMC,timestamp,status,lat,N/S,lon,E/W,speed,course,date,...
+            # Only sentence carrying the date — needed to turn GPS time
+            # into an absolute timestamp.
+            if parts[0] == '$GPRMC':
+                if len(parts) < 10 or parts[2] != 'A':
+                    return False
+                date_str = parts[9]
+                if date_str:
+                    self.date = (int(date_str[0:2]), int(date_str[2:4]),
+                                 int(date_str[4:6]))
+                return True
+
+            if parts[0] != '$GPGGA' or len(parts) < 10:
+                return False
+
             # $GPGGA,timestamp,lat,N/S,lon,E/W,fix,sats,hdop,alt,M,...
 
             # Fix Status (Index 6)
@@ -64,9 +92,11 @@ class MicropyGPS:
 
             # Latitude (Index 2, 3)
             self.latitude = self._parse_lat_lon(parts[2], parts[3])
+            self.lat_e7 = int(self.latitude * 10000000)
 
             # Longitude (Index 4, 5)
             self.longitude = self._parse_lat_lon(parts[4], parts[5])
+            self.lon_e7 = int(self.longitude * 10000000)
 
             # Altitude (Index 9)
             self.altitude = float(parts[9]) if parts[9] else 0.0
@@ -38,7 +38,11 @@ class SDCard:
 
         self.cmdbuf = bytearray(6)
         self.tokenbuf = bytearray(1)
-        self.buf = bytearray(512)
+        self.pollbuf = bytearray(16)
+        # Bytes clocked out past the R1 token by the burst poll in
+        # _cmd; for read commands the data-start token can land in
+        # this window, so _readinto scans it before the bus.
+        self._leftover = b''
 
         self.cs.init(self.cs.OUT, value=1)
         self.card_type = None
@@ -114,15 +118,29 @@ class SDCard:
         self.cmdbuf[5] = crc
         self.spi.write(self.cmdbuf)
 
-        # Wait for response
-        for _ in range(_CMD_TIMEOUT):
-            self.spi.readinto(self.tokenbuf, 0xFF)
-            if not (self.tokenbuf[0] & 0x80):
-                if readlen == 0:
-                    return self.tokenbuf[0]
-                else:
-                    r = bytearray(readlen)
-                    self.spi.readinto(r, 0xFF)
+        # Wait for response: poll 16 bytes per SPI transfer instead of
+        # one Python call per byte.
+        self._leftover = b''
+        poll = self.pollbuf
+        for _ in range(_CMD_TIMEOUT // 16):
+            self.spi.readinto(poll, 0xFF)
+            for i in range(16):
+                b = poll[i]
+                if not (b & 0x80):
+                    if readlen == 0:
+                        # The rest of the poll window has already been
+                        # clocked out; for CMD17/18 it can contain the
+                        # data-start token and the first data bytes, so
+                        # stash it instead of discarding.
+                        self._leftover = bytes(poll[i + 1:])
+                        return b
+                    # Payload bytes may already be in the poll window.
+                    r = bytearray(poll[i + 1:i + 1 + readlen])
+                    missing = readlen - len(r)
+                    if missing:
+                        tail = bytearray(missing)
+                        self.spi.readinto(tail, 0xFF)
+                        r.extend(tail)
                     return r
         return -1
 
@@ -141,18 +159,31 @@ class SDCard:
             self.cs.value(1)
             return -1
 
-        # Wait for data token
-        start_time = time.ticks_ms()
-        while time.ticks_diff(time.ticks_ms(), start_time) < 200:
-            self.spi.readinto(self.tokenbuf, 0xFF)
-            if self.tokenbuf[0] == 0xFE:  # Start block token
-                break
-            time.sleep_ms(1)
+        # The card sends only 0xFF filler between R1 and the data-start
+        # token, so any 0xFE in the stashed poll-window bytes is the
+        # token; what follows it is the head of the data block.
+        mv = memoryview(buf)
+        start = 0
+        leftover = self._leftover
+        self._leftover = b''
+        tok = leftover.find(b'\xfe')
+        if tok >= 0:
+            head = leftover[tok + 1:]
+            mv[:len(head)] = head
+            start = len(head)
         else:
-            self.cs.value(1)
-            return -1  # Timeout
+            # Wait for data token on the bus
+            start_time = time.ticks_ms()
+            while time.ticks_diff(time.ticks_ms(), start_time) < 200:
+                self.spi.readinto(self.tokenbuf, 0xFF)
+                if self.tokenbuf[0] == 0xFE:  # Start block token
+                    break
+                time.sleep_ms(1)
+            else:
+                self.cs.value(1)
+                return -1  # Timeout
 
-        self.spi.readinto(buf, 0xFF)  # Read data block
+        self.spi.readinto(mv[start:], 0xFF)  # Read rest of data block
         self.spi.write(b"\xff\xff")  # Read 2-byte CRC
         self.cs.value(1)
         return 0
@@ -189,15 +220,17 @@ class SDCard:
         if len(buf) != 512 * num_blocks:
             raise ValueError("Buffer size must be 512 * num_blocks")
 
+        # Read straight into the caller's buffer via memoryview slices —
+        # no intermediate 512-byte copy.
+        mv = memoryview(buf)
         offset = 0
         for i in range(num_blocks):
             addr = block_num + i
             if self.card_type != _CARD_TYPE_SDHC:
                 addr *= 512
 
-            if self._readinto(_CMD17, self.buf, addr) != 0:
+            if self._readinto(_CMD17, mv[offset:offset + 512], addr) != 0:
                 return -1
-            buf[offset:offset + 512] = self.buf
             offset += 512
         return 0
 
@@ -205,14 +238,15 @@ class SDCard:
         if len(buf) != 512 * num_blocks:
             raise ValueError("Buffer size must be 512 * num_blocks")
 
+        # Write the caller's buffer in place via memoryview slices.
+        mv = memoryview(buf)
         offset = 0
         for i in range(num_blocks):
             addr = block_num + i
             if self.card_type != _CARD_TYPE_SDHC:
                 addr *= 512
 
-            self.buf[:] = buf[offset:offset + 512]
-            if self._write(_CMD24, self.buf, 0xFE, addr) != 0:
+            if self._write(_CMD24, mv[offset:offset + 512], 0xFE, addr) != 0:
                 return -1
             offset += 512
         return 0
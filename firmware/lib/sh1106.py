@@ -1,6 +1,13 @@
 # Save this file as /lib/sh1106.py
 # A MicroPython driver for the SH1106 OLED display
 # Based on the official micropython-lib
+#
+# Partial-update usage: the drawing methods track which 8-pixel pages
+# they touch, and show() transmits only those pages. A status screen
+# should therefore draw static labels once at startup and then redraw
+# only the changed value fields with fill_rect()/text() — never
+# fill(0), which dirties the whole framebuffer and forces a full
+# 1 KiB transfer on the next show().
 
 from micropython import const
 import time
@@ -37,6 +44,12 @@ class SH1106(framebuf.FrameBuffer):
         # Add a 1-pixel column offset for SH1106
         self.page_offset = 2
 
+        # Dirty-page bitmask: show() only transmits pages whose bit is
+        # set. Drawing methods below mark the rows they touch, since the
+        # I2C transfer is the frame-rate bottleneck.
+        self._all_dirty = (1 << self.pages) - 1
+        self.dirty = self._all_dirty
+
         super().__init__(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
         self.rotate = rotate
         self.init_display()
@@ -84,15 +97,78 @@ class SH1106(framebuf.FrameBuffer):
     def poweron(self):
         self.write_cmd(SET_DISP | 0x01)
 
+    def mark_dirty(self, y0, y1):
+        """Flags the pages covering rows y0..y1 (inclusive) for transmit."""
+        if y0 < 0:
+            y0 = 0
+        if y1 >= self.height:
+            y1 = self.height - 1
+        for page in range(y0 >> 3, (y1 >> 3) + 1):
+            self.dirty |= 1 << page
+
+    # Wrap the framebuf drawing primitives so the pages they touch are
+    # tracked automatically.
+    def fill(self, c):
+        super().fill(c)
+        self.dirty = self._all_dirty
+
+    def pixel(self, x, y, c=None):
+        if c is None:
+            return super().pixel(x, y)
+        super().pixel(x, y, c)
+        self.mark_dirty(y, y)
+
+    def hline(self, x, y, w, c):
+        super().hline(x, y, w, c)
+        self.mark_dirty(y, y)
+
+    def vline(self, x, y, h, c):
+        super().vline(x, y, h, c)
+        self.mark_dirty(y, y + h - 1)
+
+    def line(self, x1, y1, x2, y2, c):
+        super().line(x1, y1, x2, y2, c)
+        self.mark_dirty(min(y1, y2), max(y1, y2))
+
+    def rect(self, x, y, w, h, c):
+        super().rect(x, y, w, h, c)
+        self.mark_dirty(y, y + h - 1)
+
+    def fill_rect(self, x, y, w, h, c):
+        super().fill_rect(x, y, w, h, c)
+        self.mark_dirty(y, y + h - 1)
+
+    def text(self, s, x, y, c=1):
+        super().text(s, x, y, c)
+        self.mark_dirty(y, y + 7)
+
+    def scroll(self, dx, dy):
+        super().scroll(dx, dy)
+        self.dirty = self._all_dirty
+
+    def blit(self, fbuf, x, y, *args):
+        super().blit(fbuf, x, y, *args)
+        self.dirty = self._all_dirty
+
     def show(self):
+        mv = memoryview(self.buffer)
         for page in range(self.pages):
-            self.write_cmd(0xB0 + page)  # Set page address
-            self.write_cmd(self.page_offset & 0x0F)  # Set lower column start
-            self.write_cmd(0x10 | (self.page_offset >> 4))  # Set upper column start
-
+            if not (self.dirty & (1 << page)):
+                continue
             start = page * self.width
-            end = start + self.width
-            self.write_data(self.buffer[start:end])
+            self._write_page(page, mv[start:start + self.width])
+        self.dirty = 0
+
+    def show_region(self, y0, y1):
+        """Flushes just the pages covering rows y0..y1 (plus any already dirty)."""
+        self.mark_dirty(y0, y1)
+        self.show()
+
+    def _write_page(self, page, buf):
+        self.write_cmd(0xB0 + page)  # Set page address
+        self.write_cmd(self.page_offset & 0x0F)  # Set lower column start
+        self.write_cmd(0x10 | (self.page_offset >> 4))  # Set upper column start
+        self.write_data(buf)
 
     def write_cmd(self, cmd):
         raise NotImplementedError
@@ -106,6 +182,10 @@ class SH1106_I2C(SH1106):
         self.i2c = i2c
         self.addr = addr
         self.temp = bytearray(2)
+        # Reused by write_data so no buffer is allocated per call
+        # (GC pauses on MicroPython can run into the milliseconds).
+        self._dbuf = bytearray(1 + width)
+        self._dbuf[0] = 0x40  # Co=0, D/C#=1
 
         if res is not None:
             res.init(res.OUT, value=0)
@@ -114,13 +194,26 @@ class SH1106_I2C(SH1106):
 
         super().__init__(width, height, external_vcc, rotate)
 
+    def _write_page(self, page, buf):
+        # All three page-select commands go out in one transaction
+        # (Co=0, D/C#=0 control byte, then a command stream), and the
+        # page data goes through writeto_mem with the data register as
+        # the memory address — one START/STOP each instead of four.
+        try:
+            cmds = self._pagecmd
+        except AttributeError:
+            cmds = self._pagecmd = bytearray(
+                [0x00, 0xB0, self.page_offset & 0x0F, 0x10 | (self.page_offset >> 4)])
+        cmds[1] = 0xB0 + page
+        self.i2c.writeto(self.addr, cmds)
+        self.i2c.writeto_mem(self.addr, 0x40, buf)  # Co=0, D/C#=1
+
     def write_cmd(self, cmd):
         self.temp[0] = 0x00  # Co=0, D/C#=0
         self.temp[1] = cmd
         self.i2c.writeto(self.addr, self.temp)
 
     def write_data(self, buf):
-        data = bytearray(1 + len(buf))
-        data[0] = 0x40  # Co=0, D/C#=1
-        data[1:] = buf
-        self.i2c.writeto(self.addr, data)
+        n = len(buf)
+        self._dbuf[1:1 + n] = buf
+        self.i2c.writeto(self.addr, memoryview(self._dbuf)[:1 + n])
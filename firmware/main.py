@@ -12,12 +12,18 @@
 # ADC1_CH3 (G35): RF_FILTER_PIN
 # ADC1_CH4 (G32): GSR_PIN
 
+import array
 import machine
+import micropython
+import sys
 import uos
 import time
+import ustruct
+import _thread
+from micropython import const
 import mpu6050, hmc5883l, micropyGPS, gsr_sensor
 import uhashlib, ubinascii
-from machine import Pin, SoftI2C, SPI, ADC, UART
+from machine import Pin, I2C, SPI, ADC, UART
 from sdcard import SDCard
 
 # --- Config ---
@@ -44,27 +50,154 @@ SPI_MISO_PIN = 19
 SPI_CS_PIN = 5
 SD_MOUNT_POINT = '/sd'
 
-LOG_FILE = f"{SD_MOUNT_POINT}/forensic_log_v3.csv"
-LOG_INTERVAL_MS = 100  # Log 10x/sec
+LOG_FILE = f"{SD_MOUNT_POINT}/forensic_log_v3.bin"
+LOG_INTERVAL_MS = const(100)  # Log 10x/sec
+STATUS_INTERVAL_MS = const(2000)  # REPL status print cadence
+FLUSH_SECTORS = const(64)  # flush() every 64 sectors = 32 KiB
+VERBOSE = False  # periodic status prints on the REPL console
+
+# Packed binary record. ASCII formatting cost 2-4x the bytes and a pile
+# of float->str conversions per line; this is fixed-width and hashed
+# as-is. analysis/convert_log.py turns it back into CSV offline.
+# ts u64 (absolute Unix ms once the GPS date+time are known) |
+# rf_broad/rf_filter f32 |
+# mic_air/mic_piezo/gsr u16 | accel/gyro/mag i16 x9 |
+# lat/lon i32 (fixed-point degrees * 1e7) | alt f32 |
+# prev_hash 32 raw bytes
+REC_FMT = "<QffHHHhhhhhhhhhiif32s"
+REC_SIZE = ustruct.calcsize(REC_FMT)
+rec_buf = bytearray(REC_SIZE)
+
+# Preallocate the log once so the FAT hands out clusters up front
+# (mostly contiguously) instead of updating itself on every new sector
+# while logging. The unwritten tail stays zero-filled; the analysis
+# tools stop at the first all-zero record.
+PREALLOC_BYTES = const(64 * 1024 * 1024)
 
 # AD8318 Calibration (Tune this)
 RF_SLOPE = 0.025
 RF_INTERCEPT = -95.0
 
+# dBm for every 12-bit ADC code, computed once: the per-sample path
+# becomes a table index instead of two float operations.
+RF_LUT = array.array('f', [((code / 4095) * 3.3) / RF_SLOPE + RF_INTERCEPT
+                           for code in range(4096)])
+
 # --- Globals ---
-i2c, mpu, mag, gps_uart, sd = None, None, None, None, None
+i2c, mpu, mag, gps_uart, sd, wdt = None, None, None, None, None, None
 adc_rf_broad, adc_rf_filter, adc_mic_air, adc_mic_piezo, gsr_dev = None, None, None, None, None
 gps_parser = micropyGPS.MicropyGPS()
 
+# The log file stays open for the program lifetime and all writes go
+# through a sector buffer, so the FAT never sees a small append (each
+# of those costs a full sector read-modify-write). The buffer holds
+# two sectors so a whole record can always be staged into RAM before
+# any card I/O happens — see log_stage/log_drain.
+log_fh = None
+log_pos = 0  # byte offset where this session started writing
+sector_buf = bytearray(1024)
+sector_mv = memoryview(sector_buf)
+sector_pos = 0
+sectors_since_flush = 0
+
+
+def log_stage(data):
+    """Copies one record into the sector buffer. RAM only — cannot fail.
+
+    The spare sector of headroom guarantees a record fits without
+    draining first; callers drain complete sectors afterwards.
+    """
+    global sector_pos
+    n = len(data)
+    sector_mv[sector_pos:sector_pos + n] = data
+    sector_pos += n
+
+
+def log_drain():
+    """Writes every complete buffered sector to the card.
+
+    The only failure point on the logging path: retrying it after an
+    OSError never re-stages bytes, so a transient card error cannot
+    duplicate part of a record and shear the fixed-width framing
+    (which would read as tampering on the host forever after).
+    """
+    global sector_pos, sectors_since_flush
+    while sector_pos >= 512:
+        log_fh.write(sector_mv[:512])
+        sector_mv[0:sector_pos - 512] = sector_mv[512:sector_pos]
+        sector_pos -= 512
+        sectors_since_flush += 1
+        if sectors_since_flush >= FLUSH_SECTORS:
+            log_fh.flush()
+            sectors_since_flush = 0
+
+
+def log_flush():
+    """Forces everything buffered in RAM onto the card (error paths)."""
+    global sector_pos, sectors_since_flush
+    if sector_pos:
+        log_fh.write(sector_mv[:sector_pos])
+        sector_pos = 0
+    log_fh.flush()
+    sectors_since_flush = 0
+
+
+# Ring buffer between acquisition and the SD card: when a write stalls
+# for tens to hundreds of ms the ring absorbs it instead of the sampler.
+# head/tail are single 32-bit words (atomic loads/stores on the ESP32),
+# written by exactly one side each, so no lock is needed on the indices.
+RING_SLOTS = const(256)  # ~25 s of samples at 10 Hz
+ring = bytearray(REC_SIZE * RING_SLOTS)
+ring_mv = memoryview(ring)
+ring_idx = array.array('I', [0, 0])  # [head (producer), tail (consumer)]
+drop_count = 0
+sd_lock = _thread.allocate_lock()
+
+
+def ring_put(rec):
+    head = ring_idx[0]
+    nxt = (head + 1) % RING_SLOTS
+    if nxt == ring_idx[1]:
+        return False  # full: the card has been stalled for ~25 s
+    off = head * REC_SIZE
+    ring_mv[off:off + REC_SIZE] = rec
+    ring_idx[0] = nxt
+    return True
+
+
+def sd_writer():
+    """Drains the ring onto the card. Runs on its own thread/core."""
+    while True:
+        tail = ring_idx[1]
+        if tail == ring_idx[0]:
+            time.sleep_ms(5)
+            continue
+        off = tail * REC_SIZE
+        with sd_lock:
+            log_stage(ring_mv[off:off + REC_SIZE])
+        ring_idx[1] = (tail + 1) % RING_SLOTS
+        # The record is fully staged, so only the card I/O is retried
+        # and a retry can never write the same bytes twice.
+        while True:
+            try:
+                with sd_lock:
+                    log_drain()
+                break
+            except Exception as e:
+                print(f"SD writer error: {e}")
+                time.sleep_ms(100)
+
 
 # --- Initialization ---
 def init_all():
-    global i2c, mpu, mag, gps_uart, sd, gps_parser
+    global i2c, mpu, mag, gps_uart, sd, gps_parser, log_fh, wdt
     global adc_rf_broad, adc_rf_filter, adc_mic_air, adc_mic_piezo, gsr_dev
     print("Initializing components V3.0...")
 
     try:
-        i2c = SoftI2C(scl=Pin(I2C_SCL_PIN), sda=Pin(I2C_SDA_PIN))
+        # Hardware I2C at 400 kHz: SoftI2C bit-bangs the bus from Python/C
+        # and tops out around 100 kHz.
+        i2c = I2C(0, scl=Pin(I2C_SCL_PIN), sda=Pin(I2C_SDA_PIN), freq=400000)
         mpu = mpu6050.accel(i2c)
         mag = hmc5883l.HMC5883L(i2c)
         print("I2C Sensors (IMU, Mag) OK.")
@@ -81,7 +214,8 @@ def init_all():
         gsr_dev = gsr_sensor.GSRSensor(GSR_PIN)
         print("ADC Sensors (RF, Mics, GSR) OK.")
 
-        gps_uart = UART(GPS_UART_NUM, 9600, tx=GPS_TX_PIN, rx=GPS_RX_PIN, timeout=10)
+        gps_uart = UART(GPS_UART_NUM, 9600, tx=GPS_TX_PIN, rx=GPS_RX_PIN,
+                        timeout=10, rxbuf=512)
         print("GPS OK.")
 
         spi = SPI(1, 10000000, sck=Pin(SPI_SCK_PIN), mosi=Pin(SPI_MOSI_PIN), miso=Pin(SPI_MISO_PIN))
@@ -89,13 +223,33 @@ def init_all():
         uos.mount(sd, SD_MOUNT_POINT)
         print(f"SD card mounted at {SD_MOUNT_POINT}")
 
-        # Check log file
         try:
             uos.stat(LOG_FILE)
         except OSError:
-            with open(LOG_FILE, 'w') as f:
-                f.write("timestamp,rf_broad,rf_filter,mic_air,mic_piezo,gsr_raw,"
-                        "ax,ay,az,gx,gy,gz,mx,my,mz,lat,lon,alt,prev_hash\n")
+            # Write the zeros explicitly: FatFs leaves the contents of
+            # clusters allocated by a seek past EOF undefined, so on a
+            # reused card the gap would hold stale data and the
+            # "first all-zero record" convention (find_log_end here,
+            # count_records on the host) would land on garbage. One-time
+            # cost on first boot; the watchdog is not armed yet.
+            print("Preallocating log file (first boot, takes a while)...")
+            zeros = bytes(32 * 1024)
+            with open(LOG_FILE, 'wb') as f:
+                for _ in range(PREALLOC_BYTES // len(zeros)):
+                    f.write(zeros)
+
+        # Open for update (not append: append would position past the
+        # zero fill) and seek to where the last session stopped writing.
+        log_fh = open(LOG_FILE, 'r+b')
+        global log_pos
+        log_pos = find_log_end(log_fh, uos.stat(LOG_FILE)[6])
+        log_fh.seek(log_pos)
+
+        # Hardware watchdog, armed only once init has succeeded (the
+        # retry loop in run_logger may legitimately take longer): if the
+        # main loop wedges for 5 s the device reboots and resumes the
+        # chain instead of burning battery hung.
+        wdt = machine.WDT(timeout=5000)
 
         print("--- Init complete. Starting logger. ---")
         return True
@@ -107,105 +261,235 @@ def init_all():
 
 # --- Helper Functions ---
 def get_rf_power(adc):
-    v_out = (adc.read() / 4095) * 3.3
-    dbm = (v_out / RF_SLOPE) + RF_INTERCEPT
-    return dbm
-
-
-def get_hash(data_string):
-    sha = uhashlib.sha256(data_string.encode('utf-8'))
-    return ubinascii.hexlify(sha.digest()).decode('utf-8')
-
-
-def get_last_line(filepath):
+    # 4x oversample (one extra bit of SNR), then one LUT lookup
+    s = adc.read() + adc.read() + adc.read() + adc.read()
+    return RF_LUT[s >> 2]
+
+
+def get_hash(data):
+    # Raw 32-byte digest: it chains straight into the next record, so
+    # hexlifying here would just double the hash input and allocate two
+    # throwaway objects per sample. Hex only matters for display.
+    return uhashlib.sha256(data).digest()
+
+
+def find_log_end(f, size):
+    """Byte offset of the first unwritten (all-zero) record.
+
+    Binary search over record slots: O(log n) reads, so resume cost is
+    independent of how much of the preallocation has been used.
+    """
+    zero = b'\x00' * REC_SIZE
+    lo, hi = 0, size // REC_SIZE
+    while lo < hi:
+        mid = (lo + hi) // 2
+        f.seek(mid * REC_SIZE)
+        if f.read(REC_SIZE) == zero:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo * REC_SIZE
+
+
+def get_last_record():
+    """Returns the last complete record before log_pos, or None."""
     try:
-        # This is memory-intensive. For a real CSI tool, you'd
-        # seek to the end of the file, read backwards to the last \n.
-        # This is a good-enough hack for MicroPython.
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
-            if len(lines) > 1:
-                return lines[-1].strip()
-            else:
-                return None
-    except Exception:
+        if log_pos < REC_SIZE:
+            return None
+        log_fh.seek(log_pos - REC_SIZE)
+        rec = log_fh.read(REC_SIZE)
+        log_fh.seek(log_pos)
+        # A short read here means the card is failing; treat it as no
+        # usable record rather than chaining off truncated bytes.
+        return rec if len(rec) == REC_SIZE else None
+    except OSError:
         return None
 
 
+gps_buf = bytearray(256)
+gps_mv = memoryview(gps_buf)
+gps_carry = b''
+
+
 def update_gps():
-    if gps_uart.any():
-        try:
-            line = gps_uart.readline()
-            if line: gps_parser.update(line.decode('utf-8'))
-        except Exception:
-            pass
+    """Drains the whole UART FIFO into the preallocated buffer.
+
+    readline() pulled at most one sentence per main-loop pass, so the
+    FIFO overflowed (and sentences were dropped) whenever an SD write
+    stalled the loop. A sentence split across reads is carried over to
+    the next drain.
+    """
+    global gps_carry
+    n = gps_uart.any()
+    while n:
+        r = gps_uart.readinto(gps_mv[:min(n, 256)])
+        if not r:
+            break
+        data = gps_carry + bytes(gps_mv[:r])
+        lines = data.split(b'\n')
+        gps_carry = lines[-1]  # partial sentence; completed next drain
+        for line in lines[:-1]:
+            if line:
+                try:
+                    gps_parser.update(line.decode('utf-8'))
+                except Exception:
+                    pass
+        n = gps_uart.any()
+    if len(gps_carry) > 256:  # no newline in sight: noise, drop it
+        gps_carry = b''
+
+
+# Milliseconds between the Unix epoch and tick zero, computed directly
+# from the GPS date (RMC) and time of day once both are known — the
+# on-board RTC is never set from GPS, so it cannot be the reference.
+# Before that, timestamps are plain ticks since boot — still monotonic
+# within the session.
+EPOCH_2000_S = const(946684800)  # mktime counts from 2000-01-01
+epoch_ms = 0
 
 
 def get_timestamp_ms():
-    return time.ticks_ms()
+    return epoch_ms + time.ticks_ms()
+
+
+prev_hash = b"\x00" * 32
+
+
+@micropython.native
+def log_sample(ts):
+    """One acquisition: read every sensor, pack, hash, buffer to SD.
+
+    Native-compiled — this body runs every LOG_INTERVAL_MS and is pure
+    interpreter work apart from the I2C/ADC/hash calls.
+    """
+    global prev_hash
+
+    # --- 1. Get Sensor Snapshots ---
+    rf_b = get_rf_power(adc_rf_broad)
+    rf_f = get_rf_power(adc_rf_filter)
+    mic_a = adc_mic_air.read()  # Raw ADC, faster
+    mic_p = adc_mic_piezo.read()  # Raw ADC
+    gsr_val = gsr_dev.read_raw()
+
+    a_x, a_y, a_z, g_x, g_y, g_z = mpu.get_tuple()
+    m_x, m_y, m_z = mag.read_raw()
+
+    gps = gps_parser
+    lat, lon, alt = 0, 0, 0.0
+    if gps.fix_stat > 0:
+        # Fixed-point e7 ints straight from the parser: no float
+        # attribute reads or conversions on the logging path.
+        lat, lon, alt = gps.lat_e7, gps.lon_e7, gps.altitude
+        global epoch_ms
+        if not epoch_ms and gps.date[2]:
+            # RMC date + time of day are UTC; accuracy is within one
+            # sentence interval, which is plenty for a 100 ms log grid.
+            day, month, year = gps.date
+            hh, mm, ss = gps.timestamp
+            t = time.mktime((2000 + year, month, day, hh, mm, int(ss), 0, 0))
+            epoch_ms = (t + EPOCH_2000_S) * 1000 - time.ticks_ms()
+            ts += epoch_ms  # this record gets the absolute stamp too
+
+    # --- 2. Pack Record & Hash ---
+    ustruct.pack_into(REC_FMT, rec_buf, 0,
+                      ts, rf_b, rf_f, mic_a, mic_p, gsr_val,
+                      a_x, a_y, a_z, g_x, g_y, g_z, m_x, m_y, m_z,
+                      lat, lon, alt, prev_hash)
+
+    # --- 3. Hand off to the SD writer thread ---
+    # The chain only advances over records actually handed to the
+    # writer: a dropped sample must not leave the next written record
+    # chained to bytes that never reached the card, or the host would
+    # read a full ring (a card stall, benign) as tampering forever.
+    if ring_put(rec_buf):
+        prev_hash = get_hash(rec_buf)  # Update hash for next record
+    else:
+        global drop_count
+        drop_count += 1
+    return rf_f, mic_p, gsr_val
+
+
+# Set by the hardware timer ISR, consumed (and cleared) by the main
+# loop. A bare bool store allocates nothing and is atomic on the ESP32,
+# so this is safe in hard-IRQ context.
+tick_pending = False
+
+
+def _tick_isr(t):
+    global tick_pending
+    tick_pending = True
 
 
 # --- Main Loop ---
 def run_logger():
-    if not init_all(): return
-
-    last_log_time = 0
-    last_line = get_last_line(LOG_FILE)
-    prev_hash = get_hash(last_line) if last_line else "0" * 64
-    print(f"Resuming hash chain from: {prev_hash[:10]}...")
-
-    log_buffer = []
+    global prev_hash, tick_pending
+    # Keep retrying init: an intermittently-seated SD card or sensor
+    # eventually comes up, and returning would leave the device dead.
+    while not init_all():
+        print("Init failed; retrying in 500 ms...")
+        time.sleep_ms(500)
+
+    last_status_time = 0
+    last_rec = get_last_record()
+    prev_hash = get_hash(last_rec) if last_rec else b"\x00" * 32
+    print(f"Resuming hash chain from: {ubinascii.hexlify(prev_hash[:5]).decode()}...")
+
+    _thread.start_new_thread(sd_writer, ())
+
+    # Hardware timer paces the sampling. Polling ticks_diff tied the
+    # sample instant to whatever GPS/SD work preceded it in the loop;
+    # the timer ISR fires every LOG_INTERVAL_MS regardless, so sample
+    # jitter is down to ISR latency (tens of us) instead of loop time.
+    sample_timer = machine.Timer(0)
+    sample_timer.init(period=LOG_INTERVAL_MS, mode=machine.Timer.PERIODIC,
+                      callback=_tick_isr)
+
+    backoff = 10  # ms; doubles per consecutive error, capped at 500
+
+    # Bind the per-iteration names to locals: LOAD_FAST instead of a
+    # module-dict lookup (plus an attribute lookup for the methods) on
+    # every pass of the loop.
+    ticks_ms = time.ticks_ms
+    ticks_diff = time.ticks_diff
+    sleep_ms = time.sleep_ms
+    wdt_feed = wdt.feed
+    _update_gps = update_gps
+    _log_sample = log_sample
+    _now_ms = get_timestamp_ms
 
     while True:
         try:
-            current_time = time.ticks_ms()
-            update_gps()
-
-            if time.ticks_diff(current_time, last_log_time) >= LOG_INTERVAL_MS:
-                last_log_time = current_time
-
-                # --- 1. Get Sensor Snapshots ---
-                ts = get_timestamp_ms()
-                rf_b = get_rf_power(adc_rf_broad)
-                rf_f = get_rf_power(adc_rf_filter)
-                mic_a = adc_mic_air.read()  # Raw ADC, faster
-                mic_p = adc_mic_piezo.read()  # Raw ADC
-                gsr_val = gsr_dev.read_raw()
-
-                imu = mpu.get_values()
-                a_x, a_y, a_z = imu["AcX"], imu["AcY"], imu["AcZ"]
-                g_x, g_y, g_z = imu["GyX"], imu["GyY"], imu["GyZ"]
-
-                mag_vals = mag.get_values()
-                m_x, m_y, m_z = mag_vals["MagX"], mag_vals["MagY"], mag_vals["MagZ"]
-
-                lat, lon, alt = 0.0, 0.0, 0.0
-                if gps_parser.fix_stat > 0:
-                    lat, lon, alt = gps_parser.latitude, gps_parser.longitude, gps_parser.altitude
-
-                # --- 2. Create Log Line & Hash ---
-                log_line = (f"{ts},{rf_b:.2f},{rf_f:.2f},{mic_a},{mic_p},{gsr_val},"
-                            f"{a_x},{a_y},{a_z},{g_x},{g_y},{g_z},{m_x},{m_y},{m_z},"
-                            f"{lat:.6f},{lon:.6f},{alt:.1f},{prev_hash}")
-
-                prev_hash = get_hash(log_line)  # Update hash for next loop
-                log_buffer.append(log_line + "\n")
-
-                # --- 3. Write to SD Card ---
-                if len(log_buffer) >= 20:  # Write every 2 seconds
-                    with open(LOG_FILE, 'a') as f:
-                        for line in log_buffer:
-                            f.write(line)
-                    log_buffer = []
-                    print(f"LOG: RF:{rf_f:.0f} Piezo:{mic_p} GSR:{gsr_val} GPS:{gps_parser.fix_stat}")
+            wdt_feed()
+            current_time = ticks_ms()
+            _update_gps()
+
+            if tick_pending:
+                tick_pending = False
+
+                rf_f, mic_p, gsr_val = _log_sample(_now_ms())
+
+                # Status is gated on wall time, not sample count, so
+                # dropped or delayed samples don't stretch the cadence.
+                # stdout.write over print: no keyword processing and a
+                # single UART write per status line.
+                if VERBOSE and ticks_diff(current_time, last_status_time) >= STATUS_INTERVAL_MS:
+                    last_status_time = current_time
+                    # %-substitution: no string temporaries beyond the
+                    # one line actually written.
+                    sys.stdout.write("LOG: RF:%.0f Piezo:%d GSR:%d GPS:%d DROP:%d\n"
+                                     % (rf_f, mic_p, gsr_val, gps_parser.fix_stat, drop_count))
+
+            backoff = 10  # healthy iteration; reset the error backoff
 
         except Exception as e:
             print(f"Main loop error: {e}")
-            if log_buffer:
-                with open(LOG_FILE, 'a') as f:
-                    for line in log_buffer:
-                        f.write(line)
-            time.sleep(1)
+            with sd_lock:
+                log_flush()  # don't leave evidence sitting in RAM
+            # A transient error used to cost a full second (10 samples);
+            # back off exponentially instead, and let the watchdog
+            # reboot us if the fault is persistent.
+            sleep_ms(backoff)
+            backoff = min(backoff * 2, 500)
 
 
 # Run the logger
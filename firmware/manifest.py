@@ -0,0 +1,9 @@
+# manifest.py
+# Freezes the drivers into the firmware image as cross-compiled bytecode
+# executed in place from flash: imports stop parsing .py source at boot
+# and the modules cost no heap RAM.
+#
+# Build with: make BOARD=<board> FROZEN_MANIFEST=$(pwd)/manifest.py
+
+include("$(PORT_DIR)/boards/manifest.py")
+freeze("lib")